@@ -4,77 +4,211 @@ from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                            QTextEdit, QPushButton, QLabel, QMessageBox,
                            QProgressBar, QHBoxLayout)
-from PyQt6.QtGui import QKeySequence, QShortcut, QIcon, QDragEnterEvent, QDropEvent, QPixmap
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QMetaObject, QPropertyAnimation, QEasingCurve, QMimeData
-import anthropic
+from PyQt6.QtGui import QKeySequence, QShortcut, QIcon, QDragEnterEvent, QDropEvent, QPixmap, QDesktopServices
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QPropertyAnimation, QEasingCurve, QMimeData, QUrl
 import time
 from typing import Optional
 import subprocess
 import random
 import threading
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
 import re
 import base64
 import mimetypes
-from pathlib import Path
+import hashlib
+from collections import OrderedDict
+
+
+# Image file types accepted by the attachment area
+SUPPORTED_IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif'})
+
+# Matches each <ics_file_N>...</ics_file_N> block in the API response
+ICS_FILE_PATTERN = re.compile(r'<ics_file_\d+>(.*?)</ics_file_\d+>', re.DOTALL)
+
+# Bare LF line endings, rewritten to the CRLF that RFC 5545 requires
+BARE_LF_PATTERN = re.compile(rb'(?<!\r)\n')
+
+
+class DaemonWorkerPool:
+    """Minimal worker pool whose threads are daemons.
+
+    ThreadPoolExecutor joins its (non-daemon) workers at interpreter exit, so a
+    request blocked on the network would keep the app alive after its window
+    closed. Daemon workers are simply dropped at exit along with any queued jobs.
+    """
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._jobs = queue.Queue()
+        for index in range(max_workers):
+            threading.Thread(
+                target=self._work,
+                name=f"{thread_name_prefix}_{index}",
+                daemon=True
+            ).start()
+
+    def _work(self):
+        while True:
+            future, fn, args = self._jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue  # Cancelled while queued
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def submit(self, fn, *args) -> Future:
+        """Queue fn(*args) and return a Future for it"""
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+
+# Background pool shared by every window, created on first use
+_APP_EXECUTOR = None
+_APP_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_app_executor() -> DaemonWorkerPool:
+    """Return the process-wide single-worker pool"""
+    global _APP_EXECUTOR
+    if _APP_EXECUTOR is None:
+        with _APP_EXECUTOR_LOCK:
+            if _APP_EXECUTOR is None:
+                _APP_EXECUTOR = DaemonWorkerPool(
+                    max_workers=1,
+                    thread_name_prefix="calendar_worker"
+                )
+    return _APP_EXECUTOR
+
+
+def is_supported_image(file_path: str) -> bool:
+    """Check the file extension against SUPPORTED_IMAGE_EXTENSIONS"""
+    return os.path.splitext(file_path)[1].lower() in SUPPORTED_IMAGE_EXTENSIONS
 
 
 class ImageAttachmentArea(QLabel):
     """Custom widget for handling image drag and drop"""
     # Add a signal to notify when images are added/cleared
     images_changed = pyqtSignal(bool)  # True when images added, False when cleared
+
+    # Stylesheets are built once; Qt re-parses CSS on every setStyleSheet call
+    EMPTY_STYLE = """
+        QLabel {
+            border: 2px dashed #3F3F3F;
+            border-radius: 8px;
+            padding: 12px;
+            background-color: #2D2D2D;
+            color: #86868B;
+        }
+        QLabel:hover {
+            border-color: #0A84FF;
+            background-color: #363636;
+        }
+    """
+    READY_STYLE = """
+        QLabel {
+            border: 2px dashed #0A84FF;  /* Change border to blue */
+            border-radius: 8px;
+            padding: 12px;
+            background-color: rgba(10, 132, 255, 0.1);  /* Light blue background */
+            color: #FFFFFF;  /* Brighter text */
+            font-weight: bold;  /* Make text bold */
+            font-size: 14px;  /* Slightly larger font */
+            line-height: 1.4;
+        }
+        QLabel:hover {
+            border-color: #0A84FF;
+            background-color: rgba(10, 132, 255, 0.15);
+        }
+    """
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setMinimumHeight(100)
-        self.setStyleSheet("""
-            QLabel {
-                border: 2px dashed #3F3F3F;
-                border-radius: 8px;
-                padding: 12px;
-                background-color: #2D2D2D;
-                color: #86868B;
-            }
-            QLabel:hover {
-                border-color: #0A84FF;
-                background-color: #363636;
-            }
-        """)
+        self._current_style = None
         self.reset_state()
 
+    @staticmethod
+    def _file_identity(file_path: str):
+        """Identify a file by device, inode and mtime, or None if it can't be stat'ed"""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_mtime_ns)
+
+    def _apply_style(self, style: str):
+        """Apply a stylesheet only when it differs from the active one"""
+        if style is not self._current_style:
+            self.setStyleSheet(style)
+            self._current_style = style
+
     def reset_state(self):
         self.setText("Drag & Drop Images Here")
+        self._apply_style(self.EMPTY_STYLE)
         self.image_data = []
+        self._attached_files = set()  # File identities already in image_data
         self.images_changed.emit(False)  # Notify that images were cleared
         
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
             urls = event.mimeData().urls()
-            if all(url.toLocalFile().lower().endswith(('.png', '.jpg', '.jpeg', '.gif')) for url in urls):
+            if all(is_supported_image(url.toLocalFile()) for url in urls):
                 event.acceptProposedAction()
 
+    @staticmethod
+    def _load_image(file_path: str):
+        """Read and base64-encode an image, returning (mime_type, base64_data) or None"""
+        max_attempts = 3
+        for attempt in range(max_attempts):
+            try:
+                with open(file_path, 'rb') as f:
+                    image_data = f.read()
+                mime_type = mimetypes.guess_type(file_path)[0] or 'image/jpeg'
+                base64_data = base64.b64encode(image_data).decode('utf-8')
+                return (mime_type, base64_data)
+            except FileNotFoundError:
+                # Retrying can't bring a deleted file back
+                return None
+            except Exception:
+                if attempt == max_attempts - 1:
+                    continue
+                time.sleep(0.1)
+        return None
+
     def dropEvent(self, event: QDropEvent):
         urls = event.mimeData().urls()
-        valid_images = []
+        pending = []
+        seen = set()
         
         for url in urls:
             file_path = url.toLocalFile()
-            if file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
-                max_attempts = 3
-                for attempt in range(max_attempts):
-                    try:
-                        if os.path.exists(file_path):
-                            with open(file_path, 'rb') as f:
-                                image_data = f.read()
-                                mime_type = mimetypes.guess_type(file_path)[0] or 'image/jpeg'
-                                base64_data = base64.b64encode(image_data).decode('utf-8')
-                                valid_images.append((mime_type, base64_data))
-                                break
-                    except Exception:
-                        if attempt == max_attempts - 1:
-                            continue
-                        time.sleep(0.1)
+            if is_supported_image(file_path):
+                # The stat doubles as the existence check: skip files that are gone
+                # and photos that are already attached
+                identity = self._file_identity(file_path)
+                if identity is None or identity in self._attached_files or identity in seen:
+                    continue
+                seen.add(identity)
+                pending.append((identity, file_path))
+
+        # Read multi-file drops in parallel so disk reads and encoding overlap
+        paths = [file_path for _, file_path in pending]
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+                results = list(pool.map(self._load_image, paths))
+        else:
+            results = [self._load_image(file_path) for file_path in paths]
+
+        valid_images = []
+        for (identity, _), image in zip(pending, results):
+            if image is not None:
+                valid_images.append(image)
+                self._attached_files.add(identity)
         
         if valid_images:
             self.image_data.extend(valid_images)
@@ -100,30 +234,72 @@ class ImageAttachmentArea(QLabel):
         self.setText(f"{preview_text}{secondary_text}")
         
         # Update styling to make it more noticeable
-        self.setStyleSheet("""
-            QLabel {
-                border: 2px dashed #0A84FF;  /* Change border to blue */
-                border-radius: 8px;
-                padding: 12px;
-                background-color: rgba(10, 132, 255, 0.1);  /* Light blue background */
-                color: #FFFFFF;  /* Brighter text */
-                font-weight: bold;  /* Make text bold */
-                font-size: 14px;  /* Slightly larger font */
-                line-height: 1.4;
-            }
-            QLabel:hover {
-                border-color: #0A84FF;
-                background-color: rgba(10, 132, 255, 0.15);
-            }
-        """)
+        self._apply_style(self.READY_STYLE)
 
 
 class CalendarAPIClient:
     """Separated API logic while maintaining synchronous structure"""
+    # Filled in per request with event_description, day_name and formatted_date
+    PROMPT_TEMPLATE = """You are an AI assistant specialized in creating .ics files for macOS calendar events. Your task is to generate the content of one or more .ics files based on the provided event details. These files will allow users to easily import events into their macOS Calendar application, complete with all necessary information and alarm reminders.\n\nFirst, here are the event details you need to process:\n\n<event_description>\n{event_description}\n</event_description>\n\nToday's date is {day_name}, {formatted_date}. Use this as a reference when processing relative dates (like \"tomorrow\" or \"next week\").\n\nFollow these steps to create the .ics file content:\n\n1. Carefully parse the event details to identify if there are multiple events described. If so, separate them for individual processing.\n\n2. For each event, extract all relevant information such as event title, date, time, location, description, and any other provided details.\n\n3. Generate the .ics file content using the following strict formatting rules:\n\n   REQUIRED CALENDAR STRUCTURE:\n   - BEGIN:VCALENDAR\n   - VERSION:2.0 (mandatory)\n   - PRODID:-//Your identifier//EN (mandatory)\n   \n   REQUIRED EVENT FORMATTING:\n   - BEGIN:VEVENT\n   - UID: Generate unique using format YYYYMMDDTHHMMSSZ-identifier@domain\n   - DTSTAMP: Current time in format YYYYMMDDTHHMMSSZ\n   - DTSTART: Event start in format YYYYMMDDTHHMMSSZ\n   - DTEND: Event end in format YYYYMMDDTHHMMSSZ\n   - SUMMARY: Event title\n   - DESCRIPTION: Properly escaped text using backslash before commas, semicolons, and newlines (\\, \\; \\n)\n   \n   OPTIONAL BUT RECOMMENDED:\n   - LOCATION: Venue details with proper escaping\n   - CATEGORIES: Event type/category\n   \n   REMINDER STRUCTURE:\n   - BEGIN:VALARM\n   - ACTION:DISPLAY\n   - DESCRIPTION:Reminder\n   - TRIGGER:-PT30M (or your preferred timing)\n   - END:VALARM\n   \n   CRITICAL FORMATTING RULES:\n   1. ALL datetime fields MUST include:\n      - T between date and time (e.g., 20241025T130000Z)\n      - Z suffix for UTC timezone\n   2. NO spaces before or after colons\n   3. Line endings must be CRLF (\\\\r\\\\n)\n   4. Proper content escaping:\n      - Commas: text\\, more text\n      - Semicolons: text\\; more text\n      - Newlines: text\\n more text\n   \n   CLOSING STRUCTURE:\n   - END:VEVENT\n   - END:VCALENDAR\n\n4. Ensure all text is properly escaped, replacing any newline characters in the SUMMARY, LOCATION, or DESCRIPTION fields with \"\\n\".\n\n5. Wrap each complete .ics file content in numbered <ics_file_X> tags, where X is the event number (starting from 1).\n\nHere's a detailed breakdown of the .ics file structure:\n\n```\nBEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Your Company//Your Product//EN\nBEGIN:VEVENT\nUID:YYYYMMDDTHHMMSSZ-identifier@domain.com\nDTSTAMP:20241027T120000Z           # Current time, must include T and Z\nDTSTART:20241118T200000Z           # Must include T and Z\nDTEND:20241118T210000Z             # Must include T and Z\nSUMMARY:Event Title\nLOCATION:Location with\\, escaped commas\nDESCRIPTION:Description with\\, escaped commas\\; and semicolons\\nand newlines\nBEGIN:VALARM\nACTION:DISPLAY\nDESCRIPTION:Reminder\nTRIGGER:-PT30M\nEND:VALARM\nEND:VEVENT\nEND:VCALENDAR\n```\n\nIf any required information is missing from the event details, use reasonable defaults or omit the field if it's optional. If you're unable to create a valid .ics file due to insufficient information, explain what details are missing and what the user needs to provide.\n\nRemember to pay special attention to the LOCATION field, as it's particularly important for calendar events.\n\nBefore generating the final output, wrap your thought process in <thinking> tags. Include the following steps:\na. Identify and list each event separately\nb. For each event, extract and list all relevant details (title, date, time, location, description)\nc. Note any missing information and how it will be handled\nd. Outline the structure of the .ics file, including how each piece of information will be formatted\n\nYour final output should only contain the .ics file content(s) wrapped in the appropriate tags, with no additional explanation or commentary."""
+
     def __init__(self, api_key: str):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.api_key = api_key
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._closed = threading.Event()  # Set by close() to abort retries and waits
         self.base_delay = 1
         self.max_retries = 5
+        # Recent responses keyed by request content (requests use temperature=0)
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self.max_cached_responses = 32
+
+    @property
+    def client(self):
+        """Anthropic client, built on first use from the worker thread"""
+        # Double-checked so the fast path skips the lock once initialized
+        if self._client is None:
+            with self._client_lock:
+                # Never build a fresh client after close(); its request couldn't be stopped
+                if self._closed.is_set():
+                    raise RuntimeError("API client has been closed")
+                if self._client is None:
+                    import anthropic
+                    # max_retries=0: create_calendar_event owns the retry policy, so the
+                    # SDK's own retries must not multiply attempts and backoff
+                    self._client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
+        return self._client
+
+    def close(self):
+        """Stop further retries and release the client's connections"""
+        with self._client_lock:
+            self._closed.set()
+            if self._client is not None:
+                # A request already in flight still runs until it completes or times out;
+                # the daemon worker keeps that from blocking interpreter exit
+                self._client.close()
+
+    @staticmethod
+    def _cache_key(event_description: str, formatted_date: str,
+                   image_data: list[tuple[str, str]]) -> str:
+        """Hash everything that goes into a request, length-prefixing each field"""
+        h = hashlib.blake2b(digest_size=32)
+        for field in (event_description, formatted_date,
+                      *(part for image in image_data for part in image)):
+            encoded = field.encode('utf-8')
+            h.update(len(encoded).to_bytes(8, 'little'))
+            h.update(encoded)
+        return h.hexdigest()
+
+    @staticmethod
+    def _retry_after_seconds(error) -> Optional[float]:
+        """Seconds to wait from a response's retry-after header, if it sent one"""
+        response = getattr(error, "response", None)
+        value = response.headers.get("retry-after") if response is not None else None
+        try:
+            return max(0.0, float(value)) if value is not None else None
+        except ValueError:
+            return None  # HTTP-date form; fall back to our own backoff
 
     def create_calendar_event(self, event_description: str, image_data: list[tuple[str, str]],
                          status_callback: callable) -> Optional[str]:
@@ -135,12 +311,47 @@ class CalendarAPIClient:
             status_callback: Callback for status updates
         Returns: ics_content or None on failure
         """
+        import anthropic  # Imported on the first request (worker thread), not at app startup
+
         # Add these lines at the start of the method
         current_date = datetime.now()
         day_name = current_date.strftime("%A")
         formatted_date = current_date.strftime("%B %d, %Y")
+
+        # Resubmitting the same text and images on the same day reuses the last answer
+        cache_key = self._cache_key(event_description, formatted_date, image_data)
+        with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+        if cached is not None:
+            status_callback("Using cached result for identical request...")
+            return cached
+
+        # Build the request once; retries resend the same content
+        prompt = self.PROMPT_TEMPLATE.format(
+            event_description=event_description,
+            day_name=day_name,
+            formatted_date=formatted_date
+        )
+        content = [
+            {"type": "text", "text": prompt},
+            *[{  # Add images from stored base64 data
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": mime_type,
+                    "data": base64_data
+                }
+            } for mime_type, base64_data in image_data]
+        ]
+
+        # Decorrelated jitter: each wait is drawn from [base_delay, 3 * previous wait]
+        last_delay = self.base_delay
         
         for attempt in range(self.max_retries):
+            if self._closed.is_set():
+                return None
             try:
                 status_callback(f"Attempting to create event... (Try {attempt + 1}/{self.max_retries})")
                 
@@ -150,38 +361,45 @@ class CalendarAPIClient:
                     temperature=0,
                     messages=[{
                         "role": "user",
-                        "content": [
-                            {"type": "text", "text": f"""You are an AI assistant specialized in creating .ics files for macOS calendar events. Your task is to generate the content of one or more .ics files based on the provided event details. These files will allow users to easily import events into their macOS Calendar application, complete with all necessary information and alarm reminders.\n\nFirst, here are the event details you need to process:\n\n<event_description>\n{event_description}\n</event_description>\n\nToday's date is {day_name}, {formatted_date}. Use this as a reference when processing relative dates (like \"tomorrow\" or \"next week\").\n\nFollow these steps to create the .ics file content:\n\n1. Carefully parse the event details to identify if there are multiple events described. If so, separate them for individual processing.\n\n2. For each event, extract all relevant information such as event title, date, time, location, description, and any other provided details.\n\n3. Generate the .ics file content using the following strict formatting rules:\n\n   REQUIRED CALENDAR STRUCTURE:\n   - BEGIN:VCALENDAR\n   - VERSION:2.0 (mandatory)\n   - PRODID:-//Your identifier//EN (mandatory)\n   \n   REQUIRED EVENT FORMATTING:\n   - BEGIN:VEVENT\n   - UID: Generate unique using format YYYYMMDDTHHMMSSZ-identifier@domain\n   - DTSTAMP: Current time in format YYYYMMDDTHHMMSSZ\n   - DTSTART: Event start in format YYYYMMDDTHHMMSSZ\n   - DTEND: Event end in format YYYYMMDDTHHMMSSZ\n   - SUMMARY: Event title\n   - DESCRIPTION: Properly escaped text using backslash before commas, semicolons, and newlines (\\, \\; \\n)\n   \n   OPTIONAL BUT RECOMMENDED:\n   - LOCATION: Venue details with proper escaping\n   - CATEGORIES: Event type/category\n   \n   REMINDER STRUCTURE:\n   - BEGIN:VALARM\n   - ACTION:DISPLAY\n   - DESCRIPTION:Reminder\n   - TRIGGER:-PT30M (or your preferred timing)\n   - END:VALARM\n   \n   CRITICAL FORMATTING RULES:\n   1. ALL datetime fields MUST include:\n      - T between date and time (e.g., 20241025T130000Z)\n      - Z suffix for UTC timezone\n   2. NO spaces before or after colons\n   3. Line endings must be CRLF (\\\\r\\\\n)\n   4. Proper content escaping:\n      - Commas: text\\, more text\n      - Semicolons: text\\; more text\n      - Newlines: text\\n more text\n   \n   CLOSING STRUCTURE:\n   - END:VEVENT\n   - END:VCALENDAR\n\n4. Ensure all text is properly escaped, replacing any newline characters in the SUMMARY, LOCATION, or DESCRIPTION fields with \"\\n\".\n\n5. Wrap each complete .ics file content in numbered <ics_file_X> tags, where X is the event number (starting from 1).\n\nHere's a detailed breakdown of the .ics file structure:\n\n```\nBEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Your Company//Your Product//EN\nBEGIN:VEVENT\nUID:YYYYMMDDTHHMMSSZ-identifier@domain.com\nDTSTAMP:20241027T120000Z           # Current time, must include T and Z\nDTSTART:20241118T200000Z           # Must include T and Z\nDTEND:20241118T210000Z             # Must include T and Z\nSUMMARY:Event Title\nLOCATION:Location with\\, escaped commas\nDESCRIPTION:Description with\\, escaped commas\\; and semicolons\\nand newlines\nBEGIN:VALARM\nACTION:DISPLAY\nDESCRIPTION:Reminder\nTRIGGER:-PT30M\nEND:VALARM\nEND:VEVENT\nEND:VCALENDAR\n```\n\nIf any required information is missing from the event details, use reasonable defaults or omit the field if it's optional. If you're unable to create a valid .ics file due to insufficient information, explain what details are missing and what the user needs to provide.\n\nRemember to pay special attention to the LOCATION field, as it's particularly important for calendar events.\n\nBefore generating the final output, wrap your thought process in <thinking> tags. Include the following steps:\na. Identify and list each event separately\nb. For each event, extract and list all relevant details (title, date, time, location, description)\nc. Note any missing information and how it will be handled\nd. Outline the structure of the .ics file, including how each piece of information will be formatted\n\nYour final output should only contain the .ics file content(s) wrapped in the appropriate tags, with no additional explanation or commentary."""
-                            },
-                            *[{  # Add images from stored base64 data
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": mime_type,
-                                    "data": base64_data
-                                }
-                            } for mime_type, base64_data in image_data]
-                        ]
+                        "content": content
                     }])
 
-                return message.content[0].text if isinstance(message.content, list) else message.content
-
-            except anthropic.APIError as e:
-                if "rate_limit" in str(e):
-                    delay = min(300, self.base_delay * (2 ** attempt))
-                    jitter = delay * 0.1 * random.random()
-                    status_callback(f"Rate limited, waiting {delay:.1f} seconds...")
-                    time.sleep(delay + jitter)
-                    continue
-                if attempt < self.max_retries - 1:
-                    continue
-                raise
-                
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    delay = self.base_delay * (2 ** attempt)
-                    status_callback(f"Error occurred, retrying in {delay} seconds...")
-                    time.sleep(delay)
+                response_text = message.content[0].text if isinstance(message.content, list) else message.content
+                if response_text:
+                    with self._response_cache_lock:
+                        self._response_cache[cache_key] = response_text
+                        if len(self._response_cache) > self.max_cached_responses:
+                            self._response_cache.popitem(last=False)
+                return response_text
+
+            except anthropic.RateLimitError as e:
+                # Out of attempts: surface the rate limit instead of waiting for nothing
+                if attempt == self.max_retries - 1:
+                    raise
+                # Prefer the server's own hint over our estimate
+                delay = self._retry_after_seconds(e)
+                if delay is None:
+                    delay = random.uniform(self.base_delay, last_delay * 3)
+                delay = min(300, delay)
+                last_delay = max(self.base_delay, delay)
+                status_callback(f"Rate limited, waiting {delay:.1f} seconds...")
+                self._closed.wait(delay)
+                continue
+
+            # Only network failures and server-side errors (5xx, incl. 529 overloaded) are
+            # worth retrying; auth, bad-request and local errors fail fast instead of burning attempts
+            except (anthropic.APIConnectionError, anthropic.APIStatusError) as e:
+                # A timeout means the reply was slow, not lost; regenerating it would be
+                # just as slow and billed again, so only real connection failures retry
+                if isinstance(e, anthropic.APIConnectionError):
+                    retryable = not isinstance(e, anthropic.APITimeoutError)
+                else:
+                    retryable = e.status_code >= 500
+                if retryable and attempt < self.max_retries - 1:
+                    delay = min(300, random.uniform(self.base_delay, last_delay * 3))
+                    last_delay = delay
+                    status_callback(f"Error occurred, retrying in {delay:.1f} seconds...")
+                    self._closed.wait(delay)
                     continue
                 raise
                 
@@ -195,6 +413,9 @@ class NLCalendarCreator(QMainWindow):
     enable_ui_signal = pyqtSignal(bool)
     clear_input_signal = pyqtSignal()
     show_progress_signal = pyqtSignal(bool)
+    clear_attachments_signal = pyqtSignal()
+    open_file_signal = pyqtSignal(str)
+    show_error_signal = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
@@ -392,6 +613,9 @@ class NLCalendarCreator(QMainWindow):
         self.progress_animation = QPropertyAnimation(self.progress, b"value")
         self.progress_animation.setDuration(2000)  # 2 seconds per cycle
         self.progress_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        self.progress_animation.setStartValue(0)
+        self.progress_animation.setEndValue(100)
+        self.progress_animation.setLoopCount(-1)  # Loop until stopped
 
         # Previous styling remains the same
         self.setStyleSheet("""
@@ -448,14 +672,20 @@ class NLCalendarCreator(QMainWindow):
             api_key=os.getenv("ANTHROPIC_API_KEY")
         )
 
+        # Most recent background request, cancelled if the window closes first
+        self._pending_future = None
+
         # Keyboard shortcut
         self.shortcut = QShortcut(QKeySequence("Ctrl+Shift+E"), self)
         self.shortcut.activated.connect(self.show_window)
 
-        # Progress animation
-        self.progress_timer = QTimer()
-        self.progress_timer.timeout.connect(self._update_progress)
-        self.progress_value = 0
+        # Ctrl+Enter (Cmd+Enter on macOS) submits without leaving the text box;
+        # Qt matches these in C++ so ordinary typing never reaches Python
+        self.submit_shortcuts = []
+        for sequence in ("Ctrl+Return", "Ctrl+Enter"):
+            submit_shortcut = QShortcut(QKeySequence(sequence), self)
+            submit_shortcut.activated.connect(self.process_event)
+            self.submit_shortcuts.append(submit_shortcut)
 
         # Connect the signal to the update_status method
         self.update_status_signal.connect(self.update_status)
@@ -463,20 +693,19 @@ class NLCalendarCreator(QMainWindow):
         self.enable_ui_signal.connect(self._enable_ui)
         self.clear_input_signal.connect(self._clear_input)
         self.show_progress_signal.connect(self._show_progress)
-
-    def _update_progress(self):
-        """Update progress bar animation"""
-        self.progress_value = (self.progress_value + 1) % 100
-        self.progress.setValue(self.progress_value)
+        self.clear_attachments_signal.connect(self.clear_attachments)
+        self.open_file_signal.connect(self._open_in_calendar)
+        self.show_error_signal.connect(self._show_error)
 
     def update_status(self, message: str):
-        """Update status label and process events"""
+        """Update status label (runs on the GUI thread via update_status_signal)"""
         if message:
-            self.status_label.setText(message)
+            # Skip the relayout when the same status is posted again
+            if message != self.status_label.text():
+                self.status_label.setText(message)
             self.status_label.show()
         else:
             self.status_label.hide()
-        QApplication.processEvents()
 
     def show_window(self):
         """Show the window and bring it to front"""
@@ -485,7 +714,15 @@ class NLCalendarCreator(QMainWindow):
 
     def process_event(self):
         """Process the natural language input and create calendar event"""
-        event_description = self.text_input.toPlainText().strip()
+        # Ignore shortcut presses while a request is already running
+        if not self.create_button.isEnabled():
+            return
+
+        # Skip copying the document out of Qt when it is empty
+        if self.text_input.document().isEmpty():
+            event_description = ""
+        else:
+            event_description = self.text_input.toPlainText().strip()
         has_images = bool(self.image_area.image_data)
         
         # Case 1: No text AND no images
@@ -505,11 +742,12 @@ class NLCalendarCreator(QMainWindow):
         self.enable_ui_signal.emit(False)
         self.show_progress_signal.emit(True)
 
-        # Pass image data to the thread
-        threading.Thread(
-            target=self._create_event_thread, 
-            args=(event_description, self.image_area.image_data.copy())
-        ).start()
+        # Pass image data to the shared worker pool
+        self._pending_future = get_app_executor().submit(
+            self._create_event_thread,
+            event_description,
+            self.image_area.image_data.copy()
+        )
 
     def _create_event_thread(self, event_description, image_data):
         try:
@@ -524,8 +762,7 @@ class NLCalendarCreator(QMainWindow):
                 raise Exception("Failed to get response from API after multiple retries")
 
             # Extract individual ICS files using regex
-            ics_files = re.findall(r'<ics_file_\d+>(.*?)</ics_file_\d+>', 
-                                  raw_content, re.DOTALL)
+            ics_files = ICS_FILE_PATTERN.findall(raw_content)
 
             if not ics_files:
                 # Fallback for single event (no tags)
@@ -533,20 +770,23 @@ class NLCalendarCreator(QMainWindow):
 
             self.update_status_signal.emit(f"Processing {len(ics_files)} events...")
 
+            # One timestamp per batch; the index keeps each filename unique
+            batch_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
             # Process each ICS file
             for idx, ics_content in enumerate(ics_files, 1):
                 # Clean up the content (remove any extra whitespace/newlines)
                 ics_content = ics_content.strip()
                 
                 # Generate unique filename for each event
-                filename = f"event_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{idx}.ics"
+                filename = f"event_{batch_stamp}_{idx}.ics"
                 
-                # Save to file
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(ics_content)
+                # Save to file as bytes so line endings are written exactly as normalized
+                with open(filename, 'wb') as f:
+                    f.write(BARE_LF_PATTERN.sub(b'\r\n', ics_content.encode('utf-8')))
                 
                 # Open with default calendar app
-                subprocess.run(['open', filename])
+                self.open_file_signal.emit(os.path.abspath(filename))
                 
                 self.update_status_signal.emit(f"Processed event {idx}/{len(ics_files)}")
 
@@ -559,14 +799,12 @@ class NLCalendarCreator(QMainWindow):
             
         except Exception as e:
             self.update_status_signal.emit("Error: Failed to create event(s)")
-            QMetaObject.invokeMethod(self, "_show_error",
-                                   Qt.ConnectionType.QueuedConnection,
-                                   Q_ARG(str, str(e)))
+            self.show_error_signal.emit(str(e))
         finally:
             self.enable_ui_signal.emit(True)
             self.show_progress_signal.emit(False)
-            # Clear attachments after successful creation
-            self.clear_attachments()
+            # Clear attachments after successful creation (widgets belong to the GUI thread)
+            self.clear_attachments_signal.emit()
 
     def _enable_ui(self, enabled: bool):
         """Enable or disable UI elements"""
@@ -583,34 +821,21 @@ class NLCalendarCreator(QMainWindow):
             self.progress.show()
             self.progress.setRange(0, 100)
             self.progress.setValue(0)
-            self._animate_progress()
+            self.progress_animation.start()
         else:
             self.progress_animation.stop()
             self.progress.hide()
 
-    def _animate_progress(self):
-        """Create smooth indeterminate progress animation"""
-        # Reset to start if needed
-        current_value = self.progress.value()
-        if current_value >= 100:
-            self.progress.setValue(0)
-            current_value = 0
-
-        # Configure animation
-        self.progress_animation.setStartValue(current_value)
-        self.progress_animation.setEndValue(100)
-        
-        # Connect finished signal to restart animation
-        self.progress_animation.finished.connect(self._restart_progress_animation)
-        
-        # Start animation
-        self.progress_animation.start()
-
-    def _restart_progress_animation(self):
-        """Restart the progress animation when it finishes"""
-        if self.progress.isVisible():  # Only restart if still processing
-            self.progress.setValue(0)
-            self._animate_progress()
+    def _open_in_calendar(self, path: str):
+        """Hand an .ics file to the default calendar app (called from main thread)"""
+        # Ask the platform directly; only spawn `open` if that fails
+        if not QDesktopServices.openUrl(QUrl.fromLocalFile(path)):
+            try:
+                subprocess.Popen(['open', path])
+            except OSError as e:
+                # An exception escaping a slot would abort the app; report it instead
+                self.update_status(f"Error: Could not open {os.path.basename(path)}")
+                self._show_error(f"Could not open {path} in your calendar app: {e}")
 
     def _show_error(self, message: str):
         """Show error message box (called from main thread)"""
@@ -621,6 +846,13 @@ class NLCalendarCreator(QMainWindow):
         self.image_area.reset_state()
         self.clear_attachments_btn.hide()
 
+    def closeEvent(self, event):
+        """Cancel queued work and stop retries before closing"""
+        if self._pending_future is not None:
+            self._pending_future.cancel()
+        self.api_client.close()
+        super().closeEvent(event)
+
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)